@@ -106,7 +106,70 @@ ON CONFLICT (email) DO NOTHING;
 CREATE INDEX IF NOT EXISTS idx_athletes_coach_id ON athletes(coach_id);
 CREATE INDEX IF NOT EXISTS idx_athletes_dojo_id ON athletes(dojo_id);
 CREATE INDEX IF NOT EXISTS idx_athletes_name_dob ON athletes(full_name, date_of_birth);
+-- Trigram index so the '%query%' ILIKE name search can use an index scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_athletes_name_trgm ON athletes USING gin (full_name gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_coaches_email ON coaches(email);
 CREATE INDEX IF NOT EXISTS idx_allowed_emails_email ON allowed_emails(email);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_coach_id ON audit_logs(coach_id);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at DESC);
+
+-- ============================================
+-- FUNCTIONS (server-side aggregation)
+-- ============================================
+-- Runs as the calling user (SECURITY INVOKER), so RLS still scopes the
+-- counts to the coach's own athletes, or all athletes for admins.
+CREATE OR REPLACE FUNCTION athlete_stats()
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT json_build_object(
+        'total', COUNT(*),
+        'by_day', json_build_object(
+            'Day 1', COUNT(*) FILTER (WHERE competition_day = 'Day 1'),
+            'Day 2', COUNT(*) FILTER (WHERE competition_day = 'Day 2'),
+            'Both', COUNT(*) FILTER (WHERE competition_day = 'Both')
+        ),
+        'by_belt', COALESCE(
+            (SELECT json_object_agg(belt_rank, cnt)
+             FROM (SELECT belt_rank, COUNT(*) AS cnt FROM athletes GROUP BY belt_rank) b),
+            '{}'::json
+        ),
+        'by_gender', json_build_object(
+            'Male', COUNT(*) FILTER (WHERE gender = 'Male'),
+            'Female', COUNT(*) FILTER (WHERE gender = 'Female')
+        ),
+        'kata', COUNT(*) FILTER (WHERE kata_event),
+        'kumite', COUNT(*) FILTER (WHERE kumite_event)
+    )
+    FROM athletes;
+$$;
+
+-- Audit log summary for the admin Audit Logs page.
+-- RLS on audit_logs keeps this admin-only.
+CREATE OR REPLACE FUNCTION audit_summary()
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT json_build_object(
+        'total_entries', (SELECT COUNT(*) FROM audit_logs),
+        'by_action', COALESCE(
+            (SELECT json_object_agg(action, cnt)
+             FROM (SELECT action, COUNT(*) AS cnt FROM audit_logs GROUP BY action) a),
+            '{}'::json
+        ),
+        'by_dojo', COALESCE(
+            (SELECT json_object_agg(dojo_name, cnt)
+             FROM (SELECT dojo_name, COUNT(*) AS cnt FROM audit_logs GROUP BY dojo_name) d),
+            '{}'::json
+        ),
+        'recent_activity', COALESCE(
+            (SELECT json_agg(r ORDER BY r.created_at DESC)
+             FROM (SELECT id, action, athlete_data, coach_email, dojo_name, created_at
+                   FROM audit_logs ORDER BY created_at DESC LIMIT 10) r),
+            '[]'::json
+        )
+    );
+$$;
@@ -21,12 +21,12 @@ if os.path.exists(css_path):
     with open(css_path) as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
 
-from src.auth.session import init_session_state, require_auth, require_onboarding, get_current_coach
+from src.auth.session import init_session_state, require_auth, require_onboarding
 from src.components.sidebar import render_sidebar
-from src.services.athlete_service import register_athlete, bulk_register_athletes, check_duplicate_athlete
+from src.services.athlete_service import register_athlete, bulk_register_athletes
 from src.services.config_service import is_registration_open
 from src.utils.validators import BELT_RANKS, GENDERS, COMPETITION_DAYS, validate_athlete_data
-from src.utils.excel_handler import parse_excel_file, generate_excel_template
+from src.utils.excel_handler import parse_excel_file_cached, generate_excel_template
 
 init_session_state()
 require_auth()
@@ -35,9 +35,6 @@ require_onboarding()
 # Render sidebar
 render_sidebar()
 
-coach = get_current_coach()
-dojo_id = coach.get('dojo_id') if coach else None
-
 # Header
 st.markdown("""
     <h1 style="
@@ -146,18 +143,15 @@ with tab_single:
                 for error in errors:
                     st.error(f"❌ {error}")
             else:
-                # Check for duplicate
-                if check_duplicate_athlete(full_name, str(date_of_birth), dojo_id):
-                    st.error(f"⚠️ An athlete named '{full_name}' with this date of birth already exists in your dojo.")
-                else:
-                    with st.spinner("Registering athlete..."):
-                        result = register_athlete(athlete_data)
-                        
-                        if result['success']:
-                            st.success(f"✅ Successfully registered: **{full_name}**")
-                            st.balloons()
-                        else:
-                            st.error(f"❌ {result['error']}")
+                # Duplicates are reported by register_athlete (unique constraint)
+                with st.spinner("Registering athlete..."):
+                    result = register_athlete(athlete_data)
+                    
+                    if result['success']:
+                        st.success(f"✅ Successfully registered: **{full_name}**")
+                        st.balloons()
+                    else:
+                        st.error(f"❌ {result['error']}")
 
 
 # ===== BULK UPLOAD TAB =====
@@ -203,7 +197,7 @@ with tab_bulk:
     
     if uploaded_file:
         with st.spinner("Processing file..."):
-            success, athletes, errors = parse_excel_file(uploaded_file)
+            success, athletes, errors = parse_excel_file_cached(uploaded_file.getvalue())
         
         if errors:
             with st.expander(f"⚠️ {len(errors)} Validation Errors", expanded=True):
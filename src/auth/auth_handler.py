@@ -5,7 +5,7 @@ Manages user authentication via Supabase Auth (Email + Google OAuth)
 
 import streamlit as st
 from typing import Optional, Dict, Any
-from src.auth.supabase_client import get_supabase_client
+from src.auth.supabase_client import get_supabase_client, get_authenticated_client
 from src.auth.session import clear_session
 from src.auth.whitelist import check_email_whitelist
 
@@ -186,6 +186,9 @@ def sign_out() -> bool:
         st.error(f"Error signing out: {e}")
         supabase_ok = False
     
+    # Drop cached per-token clients so the signed-out token is not reused
+    get_authenticated_client.clear()
+    
     try:
         # Clear session state and cookies
         clear_session()
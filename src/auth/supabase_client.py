@@ -4,9 +4,12 @@ Handles connection to Supabase with proper error handling
 """
 
 import streamlit as st
-from supabase import create_client, Client
+from typing import TYPE_CHECKING
 from functools import lru_cache
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 
 def get_supabase_config():
     """Get Supabase configuration from Streamlit secrets"""
@@ -22,21 +25,32 @@ def get_supabase_config():
 
 
 @st.cache_resource
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """
     Get a cached Supabase client instance.
     Uses Streamlit's cache_resource to maintain connection across reruns.
     """
+    # Imported lazily so pages that never touch the database skip loading supabase
+    from supabase import create_client
+    
     config = get_supabase_config()
     return create_client(config["url"], config["key"])
 
 
-def get_authenticated_client(access_token: str) -> Client:
+@st.cache_resource(ttl=3000)  # Slightly under the default 1h token lifetime
+def get_authenticated_client(access_token: str) -> "Client":
     """
-    Get a Supabase client with user's access token for RLS.
+    Get a cached Supabase client with user's access token for RLS.
     This ensures queries respect Row Level Security policies.
+    Cached per token, so each user reuses one client across reruns.
+
+    The token is attached to the PostgREST headers directly instead of going
+    through auth.set_session(), which calls GoTrue to re-validate the user on
+    every invocation. PostgREST verifies the JWT (including expiry) itself.
     """
+    from supabase import create_client
+
     config = get_supabase_config()
     client = create_client(config["url"], config["key"])
-    client.auth.set_session(access_token, "")
+    client.postgrest.auth(access_token)
     return client
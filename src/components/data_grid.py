@@ -4,7 +4,6 @@ Virtualized data table with search and filter capabilities
 """
 
 import streamlit as st
-import pandas as pd
 from typing import List, Dict, Any, Optional, Callable
 
 
@@ -31,6 +30,8 @@ def render_data_grid(
         on_edit: Callback when edit is clicked
         on_delete: Callback when delete is clicked
     """
+    import pandas as pd
+    
     if not data:
         st.info("📋 No data to display")
         return
@@ -127,6 +128,8 @@ def render_athletes_table(
     """
     Specialized athletes table with common column configuration.
     """
+    import pandas as pd
+    
     columns = [
         {'field': 'full_name', 'header': 'Name', 'width': 2},
         {'field': 'date_of_birth', 'header': 'DOB', 'width': 1},
@@ -141,49 +144,38 @@ def render_athletes_table(
     if show_coach:
         columns.append({'field': 'coaches.full_name', 'header': 'Coach', 'width': 1})
     
-    # Prepare data with formatted values
-    formatted_data = []
-    for athlete in athletes:
-        formatted = athlete.copy()
-        
-        # Format events as icons
-        events = []
-        if athlete.get('kata_event'):
-            events.append('🥋')
-        if athlete.get('kumite_event'):
-            events.append('👊')
-        formatted['events_display'] = ' '.join(events) or '-'
-        
-        formatted_data.append(formatted)
-    
-    # Create DataFrame
-    df = pd.DataFrame(formatted_data)
-    
-    if df.empty:
+    if not athletes:
         st.info("📋 No athletes registered yet")
         return None
     
-    # Build display columns
-    display_data = []
-    for athlete in formatted_data:
-        row = {
-            'Name': athlete.get('full_name', ''),
-            'DOB': str(athlete.get('date_of_birth', ''))[:10],
-            'Gender': athlete.get('gender', ''),
-            'Belt': athlete.get('belt_rank', ''),
-            'Day': athlete.get('competition_day', ''),
-            'Events': athlete.get('events_display', '')
-        }
-        
-        if show_dojo:
-            dojo = athlete.get('dojos', {})
-            row['Dojo'] = dojo.get('name', '') if isinstance(dojo, dict) else ''
-        
-        if show_coach:
-            coach = athlete.get('coaches', {})
-            row['Coach'] = coach.get('full_name', '') if isinstance(coach, dict) else ''
-        
-        display_data.append(row)
+    # Build display columns directly from the source rows (no per-row copies)
+    display_data = {
+        'Name': [a.get('full_name', '') for a in athletes],
+        'DOB': [str(a.get('date_of_birth', ''))[:10] for a in athletes],
+        'Gender': [a.get('gender', '') for a in athletes],
+        'Belt': [a.get('belt_rank', '') for a in athletes],
+        'Day': [a.get('competition_day', '') for a in athletes],
+        # Format events as icons
+        'Events': [
+            '🥋 👊' if a.get('kata_event') and a.get('kumite_event')
+            else '🥋' if a.get('kata_event')
+            else '👊' if a.get('kumite_event')
+            else '-'
+            for a in athletes
+        ]
+    }
+    
+    if show_dojo:
+        display_data['Dojo'] = [
+            a['dojos'].get('name', '') if isinstance(a.get('dojos'), dict) else ''
+            for a in athletes
+        ]
+    
+    if show_coach:
+        display_data['Coach'] = [
+            a['coaches'].get('full_name', '') if isinstance(a.get('coaches'), dict) else ''
+            for a in athletes
+        ]
     
     display_df = pd.DataFrame(display_data)
     
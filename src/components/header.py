@@ -3,10 +3,98 @@ Header Component
 Page header with tournament branding
 """
 
+import html
+import re
 import streamlit as st
 from src.services.config_service import get_tournament_name, get_time_until_deadline, is_registration_open
 
 
+def _minify(markup: str) -> str:
+    """Collapse whitespace in an HTML snippet (none of these contain <pre>)."""
+    return re.sub(r'\s+', ' ', markup).strip()
+
+
+# Static HTML templates - built once at import, only dynamic fields are formatted per rerun
+_HEADER_TITLE_TMPL = _minify("""
+    <h1 style="
+        font-size: 1.75rem;
+        font-weight: 700;
+        margin: 0;
+        background: linear-gradient(135deg, #e2e8f0 0%, #94a3b8 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+    ">{title}</h1>
+""")
+
+_HEADER_SUBTITLE_TMPL = _minify("""
+    <p style="color: #64748b; margin-top: 0.25rem; font-size: 0.9rem;">
+        {subtitle}
+    </p>
+""")
+
+_HEADER_SPACER_HTML = "<div style='margin-bottom: 1.5rem;'></div>"
+
+_STATUS_OPEN_TMPL = _minify("""
+    <div style="
+        background: rgba(16, 185, 129, 0.1);
+        border: 1px solid #10b981;
+        border-radius: 8px;
+        padding: 0.5rem 0.75rem;
+        text-align: center;
+    ">
+        <p style="color: #10b981; font-weight: 600; margin: 0; font-size: 0.8rem;">
+            ✅ Registration Open
+        </p>
+        {time_html}
+    </div>
+""")
+
+_STATUS_TIME_TMPL = '<p style="color: #64748b; font-size: 0.7rem; margin: 0.25rem 0 0 0;">{time_remaining}</p>'
+
+_STATUS_CLOSED_HTML = _minify("""
+    <div style="
+        background: rgba(239, 68, 68, 0.1);
+        border: 1px solid #ef4444;
+        border-radius: 8px;
+        padding: 0.5rem 0.75rem;
+        text-align: center;
+    ">
+        <p style="color: #ef4444; font-weight: 600; margin: 0; font-size: 0.8rem;">
+            🔒 Registration Closed
+        </p>
+    </div>
+""")
+
+_STAT_CARD_TMPL = _minify("""
+    <div style="
+        background: linear-gradient(135deg, #1a1a2e 0%, #252542 100%);
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        border-radius: 12px;
+        padding: 1.25rem;
+        text-align: center;
+    ">
+        <p style="
+            font-size: 2rem;
+            font-weight: 700;
+            background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin: 0;
+        ">{icon} {value}</p>
+        <p style="
+            font-size: 0.75rem;
+            color: #94a3b8;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+            margin: 0.25rem 0 0 0;
+        ">{label}</p>
+        {delta_html}
+    </div>
+""")
+
+_STAT_DELTA_TMPL = '<p style="font-size: 0.7rem; color: #10b981; margin: 0.25rem 0 0 0;">{delta}</p>'
+
+
 def render_header(title: str = None, subtitle: str = None, show_status: bool = True):
     """
     Render the page header with optional tournament info.
@@ -23,61 +111,27 @@ def render_header(title: str = None, subtitle: str = None, show_status: bool = T
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        st.markdown(f"""
-            <h1 style="
-                font-size: 1.75rem;
-                font-weight: 700;
-                margin: 0;
-                background: linear-gradient(135deg, #e2e8f0 0%, #94a3b8 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            ">{display_title}</h1>
-        """, unsafe_allow_html=True)
+        st.markdown(_HEADER_TITLE_TMPL.format(title=html.escape(display_title)), unsafe_allow_html=True)
         
         if subtitle:
-            st.markdown(f"""
-                <p style="color: #64748b; margin-top: 0.25rem; font-size: 0.9rem;">
-                    {subtitle}
-                </p>
-            """, unsafe_allow_html=True)
+            st.markdown(_HEADER_SUBTITLE_TMPL.format(subtitle=subtitle), unsafe_allow_html=True)
     
     with col2:
         if show_status:
             render_registration_status()
     
-    st.markdown("<div style='margin-bottom: 1.5rem;'></div>", unsafe_allow_html=True)
+    st.markdown(_HEADER_SPACER_HTML, unsafe_allow_html=True)
 
 
 def render_registration_status():
     """Render the registration status badge."""
-    is_open = is_registration_open()
-    time_remaining = get_time_until_deadline()
+    if not is_registration_open():
+        st.markdown(_STATUS_CLOSED_HTML, unsafe_allow_html=True)
+        return
     
-    if is_open:
-        status_color = "#10b981"  # Green
-        status_bg = "rgba(16, 185, 129, 0.1)"
-        status_text = "Registration Open"
-        icon = "✅"
-    else:
-        status_color = "#ef4444"  # Red
-        status_bg = "rgba(239, 68, 68, 0.1)"
-        status_text = "Registration Closed"
-        icon = "🔒"
-    
-    st.markdown(f"""
-        <div style="
-            background: {status_bg};
-            border: 1px solid {status_color};
-            border-radius: 8px;
-            padding: 0.5rem 0.75rem;
-            text-align: center;
-        ">
-            <p style="color: {status_color}; font-weight: 600; margin: 0; font-size: 0.8rem;">
-                {icon} {status_text}
-            </p>
-            {f'<p style="color: #64748b; font-size: 0.7rem; margin: 0.25rem 0 0 0;">{time_remaining}</p>' if time_remaining and is_open else ''}
-        </div>
-    """, unsafe_allow_html=True)
+    time_remaining = get_time_until_deadline()
+    time_html = _STATUS_TIME_TMPL.format(time_remaining=time_remaining) if time_remaining else ''
+    st.markdown(_STATUS_OPEN_TMPL.format(time_html=time_html), unsafe_allow_html=True)
 
 
 def render_stat_cards(stats: dict):
@@ -96,34 +150,11 @@ def render_stat_cards(stats: dict):
     
     for col, stat in zip(cols, stats_list):
         with col:
-            label = stat.get('label', '')
-            value = stat.get('value', 0)
-            icon = stat.get('icon', '')
-            delta = stat.get('delta', None)
+            delta = stat.get('delta')
             
-            st.markdown(f"""
-                <div style="
-                    background: linear-gradient(135deg, #1a1a2e 0%, #252542 100%);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: 1.25rem;
-                    text-align: center;
-                ">
-                    <p style="
-                        font-size: 2rem;
-                        font-weight: 700;
-                        background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%);
-                        -webkit-background-clip: text;
-                        -webkit-text-fill-color: transparent;
-                        margin: 0;
-                    ">{icon} {value}</p>
-                    <p style="
-                        font-size: 0.75rem;
-                        color: #94a3b8;
-                        text-transform: uppercase;
-                        letter-spacing: 0.05em;
-                        margin: 0.25rem 0 0 0;
-                    ">{label}</p>
-                    {f'<p style="font-size: 0.7rem; color: #10b981; margin: 0.25rem 0 0 0;">{delta}</p>' if delta else ''}
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_STAT_CARD_TMPL.format_map({
+                'icon': stat.get('icon', ''),
+                'value': stat.get('value', 0),
+                'label': stat.get('label', ''),
+                'delta_html': _STAT_DELTA_TMPL.format(delta=delta) if delta else ''
+            }), unsafe_allow_html=True)
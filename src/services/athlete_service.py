@@ -5,53 +5,26 @@ Handles all athlete-related database operations with audit logging
 """
 
 import streamlit as st
+from collections import Counter
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from src.auth.supabase_client import get_supabase_client, get_authenticated_client
 from src.auth.session import get_current_user, get_current_coach, get_user_dojo_id
 from src.services.audit_service import create_audit_log
+from src.utils.validators import GENDERS, COMPETITION_DAYS
 
 
-def check_duplicate_athlete(full_name: str, date_of_birth: str, dojo_id: str) -> bool:
-    """
-    Check if athlete already exists (Name + DOB + Dojo).
-    Returns True if duplicate exists.
-    """
-    try:
-        # Check duplicate logic could be done with anon client if RLS allowed select, 
-        # but RLS restricts viewing athletes to own coach/admin.
-        # So we MUST use authenticated client.
-        if not st.session_state.get('session'):
-             return False
-             
-        token = st.session_state.session.access_token
-        supabase = get_authenticated_client(token)
-        
-        # If dojo_id is None, maybe we can't check? 
-        # But RLS enforces we only see our own athletes anyway.
-        # Actually duplicate check should ideally be GLOBAL? 
-        # No, uniqueness is (Name + DOB + Dojo).
-        # So checking our own view is sufficient.
-        
-        query = supabase.table('athletes')\
-            .select('id')\
-            .eq('full_name', full_name.strip())\
-            .eq('date_of_birth', date_of_birth)
-            
-        if dojo_id:
-            query = query.eq('dojo_id', dojo_id)
-            
-        result = query.execute()
-        
-        return len(result.data) > 0
-    except Exception as e:
-        st.error(f"Error checking duplicate: {e}")
-        return False
+# Postgres error code for unique constraint violations
+UNIQUE_VIOLATION = '23505'
+
+# Rows per duplicate pre-check query in bulk registration
+DUPLICATE_CHECK_CHUNK = 100
 
 
 def register_athlete(athlete_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Register a single athlete with duplicate check and audit logging.
+    Register a single athlete with audit logging.
+    Duplicates are rejected by the database's unique constraint.
     """
     user = get_current_user()
     coach = get_current_coach()
@@ -63,17 +36,8 @@ def register_athlete(athlete_data: Dict[str, Any]) -> Dict[str, Any]:
     if not dojo_id:
         return {'success': False, 'error': 'No dojo associated with your account'}
     
-    # Check for duplicate
-    if check_duplicate_athlete(
-        athlete_data['full_name'],
-        athlete_data['date_of_birth'],
-        dojo_id
-    ):
-        return {
-            'success': False,
-            'error': f"Athlete '{athlete_data['full_name']}' with this date of birth already exists in your dojo."
-        }
-    
+    # Duplicates are rejected by the (full_name, date_of_birth, dojo_id) unique
+    # constraint, so no separate SELECT is needed before inserting
     try:
         if not st.session_state.get('session'):
             return {'success': False, 'error': 'Not authenticated'}
@@ -98,6 +62,8 @@ def register_athlete(athlete_data: Dict[str, Any]) -> Dict[str, Any]:
         result = supabase.table('athletes').insert(data).execute()
         
         if result.data:
+            _invalidate_athlete_caches()
+            
             # Create audit log
             create_audit_log(
                 action='REGISTER',
@@ -113,10 +79,15 @@ def register_athlete(athlete_data: Dict[str, Any]) -> Dict[str, Any]:
             
     except Exception as e:
         error_msg = str(e)
-        if 'duplicate key' in error_msg.lower() or 'unique constraint' in error_msg.lower():
+        # postgrest's APIError carries the Postgres error code
+        if (
+            getattr(e, 'code', None) == UNIQUE_VIOLATION
+            or 'duplicate key' in error_msg.lower()
+            or 'unique constraint' in error_msg.lower()
+        ):
             return {
                 'success': False,
-                'error': f"Athlete '{athlete_data['full_name']}' already exists."
+                'error': f"Athlete '{athlete_data['full_name']}' with this date of birth already exists in your dojo."
             }
         return {'success': False, 'error': error_msg}
 
@@ -138,76 +109,107 @@ def bulk_register_athletes(athletes_data: List[Dict[str, Any]]) -> Dict[str, Any
     if not dojo_id:
         return {'success': False, 'error': 'No dojo associated with your account', 'results': []}
     
-    results = []
-    successful = 0
-    failed = 0
-
     if not st.session_state.get('session'):
         return {'success': False, 'error': 'Not authenticated', 'results': []}
             
     token = st.session_state.session.access_token
     supabase = get_authenticated_client(token)
     
+    # Fetch existing (name, dob) pairs, DUPLICATE_CHECK_CHUNK rows per query
+    # so the in_() filters stay well under gateway URI-length limits
+    existing_set = set()
+    for start in range(0, len(athletes_data), DUPLICATE_CHECK_CHUNK):
+        chunk = athletes_data[start:start + DUPLICATE_CHECK_CHUNK]
+        names = list({a['full_name'].strip() for a in chunk})
+        dobs = list({a['date_of_birth'] for a in chunk})
+        try:
+            existing = supabase.table('athletes')\
+                .select('full_name, date_of_birth')\
+                .in_('full_name', names)\
+                .in_('date_of_birth', dobs)\
+                .eq('dojo_id', dojo_id)\
+                .execute()
+            existing_set.update((r['full_name'], r['date_of_birth']) for r in existing.data or [])
+        except Exception:
+            # Pre-check only - the unique constraint still rejects duplicates on insert
+            pass
+    
+    # Build all non-duplicate rows up front so they can be sent in one request
+    rows = []
+    row_names = []
+    failures = []
     for athlete_data in athletes_data:
-        # Check duplicate
-        if check_duplicate_athlete(
-            athlete_data['full_name'],
-            athlete_data['date_of_birth'],
-            dojo_id
-        ):
-            results.append({
+        # Check duplicate (also catches repeats within the same upload)
+        dedup_key = (athlete_data['full_name'].strip(), athlete_data['date_of_birth'])
+        if dedup_key in existing_set:
+            failures.append({
                 'name': athlete_data['full_name'],
                 'success': False,
                 'error': 'Duplicate - already exists'
             })
-            failed += 1
             continue
         
+        existing_set.add(dedup_key)
+        rows.append({
+            'coach_id': user.id,
+            'dojo_id': dojo_id,
+            'full_name': athlete_data['full_name'].strip(),
+            'date_of_birth': athlete_data['date_of_birth'],
+            'gender': athlete_data['gender'],
+            'belt_rank': athlete_data['belt_rank'],
+            'weight_kg': athlete_data.get('weight_kg'),
+            'competition_day': athlete_data['competition_day'],
+            'kata_event': athlete_data.get('kata_event', False),
+            'kumite_event': athlete_data.get('kumite_event', False)
+        })
+        row_names.append(athlete_data['full_name'])
+    
+    inserted_names = []
+    if rows:
         try:
-            data = {
-                'coach_id': user.id,
-                'dojo_id': dojo_id,
-                'full_name': athlete_data['full_name'].strip(),
-                'date_of_birth': athlete_data['date_of_birth'],
-                'gender': athlete_data['gender'],
-                'belt_rank': athlete_data['belt_rank'],
-                'weight_kg': athlete_data.get('weight_kg'),
-                'competition_day': athlete_data['competition_day'],
-                'kata_event': athlete_data.get('kata_event', False),
-                'kumite_event': athlete_data.get('kumite_event', False)
-            }
-            
-            result = supabase.table('athletes').insert(data).execute()
-            
-            if result.data:
-                results.append({
-                    'name': athlete_data['full_name'],
-                    'success': True
-                })
-                successful += 1
-            else:
-                results.append({
-                    'name': athlete_data['full_name'],
-                    'success': False,
-                    'error': 'Insert failed'
-                })
-                failed += 1
-                
-        except Exception as e:
-            results.append({
-                'name': athlete_data['full_name'],
-                'success': False,
-                'error': str(e)
-            })
-            failed += 1
+            # Single multi-row INSERT - PostgREST applies it atomically
+            result = supabase.table('athletes').insert(rows).execute()
+            bulk_ok = bool(result.data)
+        except Exception:
+            bulk_ok = False
+        
+        if bulk_ok:
+            inserted_names = row_names
+        else:
+            # The batch was rejected as a whole; retry row by row so one bad
+            # row doesn't fail the rest and each failure gets its own error
+            for name, data in zip(row_names, rows):
+                try:
+                    result = supabase.table('athletes').insert(data).execute()
+                    
+                    if result.data:
+                        inserted_names.append(name)
+                    else:
+                        failures.append({
+                            'name': name,
+                            'success': False,
+                            'error': 'Insert failed'
+                        })
+                        
+                except Exception as e:
+                    failures.append({
+                        'name': name,
+                        'success': False,
+                        'error': str(e)
+                    })
+    
+    results = [{'name': name, 'success': True} for name in inserted_names] + failures
+    successful = len(inserted_names)
     
-    # Create bulk audit log
     if successful > 0:
+        _invalidate_athlete_caches()
+        
+        # Create bulk audit log
         create_audit_log(
             action='BULK_REGISTER',
             athlete_data={
                 'count': successful,
-                'athletes': [r['name'] for r in results if r['success']]
+                'athletes': inserted_names
             },
             coach_id=user.id,
             coach_email=user.email,
@@ -217,11 +219,51 @@ def bulk_register_athletes(athletes_data: List[Dict[str, Any]]) -> Dict[str, Any
     return {
         'success': True,
         'successful': successful,
-        'failed': failed,
+        'failed': len(failures),
         'results': results
     }
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_athletes_cached(
+    user_id: str,
+    token: str,
+    search_query: Optional[str],
+    filter_day: Optional[str],
+    filter_belt: Optional[str]
+) -> List[Dict]:
+    """
+    Cached athlete query.
+    Keyed on user and token so cached rows never cross RLS scopes.
+    """
+    supabase = get_authenticated_client(token)
+    
+    query = supabase.table('athletes')\
+        .select('*, dojos(name), coaches(full_name, email)')
+    
+    # If not fetching all (admin), filter by coach
+    # RLS should handle this, but explicit filter can be added for clarity/performance if needed
+    # For now, rely on RLS for non-admin users.
+    
+    # Apply search filter
+    if search_query:
+        query = query.ilike('full_name', f'%{search_query}%')
+    
+    # Apply day filter
+    if filter_day and filter_day != 'All':
+        query = query.eq('competition_day', filter_day)
+    
+    # Apply belt filter
+    if filter_belt and filter_belt != 'All':
+        query = query.eq('belt_rank', filter_belt)
+    
+    # Order by creation date (newest first)
+    query = query.order('created_at', desc=True)
+    
+    result = query.execute()
+    return result.data if result.data else []
+
+
 def get_athletes(
     search_query: str = None, 
     filter_day: str = None,
@@ -233,42 +275,24 @@ def get_athletes(
     Respects RLS policies via authenticated client.
     """
     try:
-        if not st.session_state.get('session'):
+        user = get_current_user()
+        if not user or not st.session_state.get('session'):
              return []
              
         token = st.session_state.session.access_token
-        supabase = get_authenticated_client(token)
-        
-        query = supabase.table('athletes')\
-            .select('*, dojos(name), coaches(full_name, email)')
-        
-        # If not fetching all (admin), filter by coach
-        # RLS should handle this, but explicit filter can be added for clarity/performance if needed
-        # For now, rely on RLS for non-admin users.
-        
-        # Apply search filter
-        if search_query:
-            query = query.ilike('full_name', f'%{search_query}%')
-        
-        # Apply day filter
-        if filter_day and filter_day != 'All':
-            query = query.eq('competition_day', filter_day)
-        
-        # Apply belt filter
-        if filter_belt and filter_belt != 'All':
-            query = query.eq('belt_rank', filter_belt)
-        
-        # Order by creation date (newest first)
-        query = query.order('created_at', desc=True)
-        
-        result = query.execute()
-        return result.data if result.data else []
+        return _get_athletes_cached(user.id, token, search_query, filter_day, filter_belt)
         
     except Exception as e:
         st.error(f"Error fetching athletes: {e}")
         return []
 
 
+def _invalidate_athlete_caches():
+    """Drop cached athlete reads after a successful write."""
+    _get_athletes_cached.clear()
+    _get_athlete_stats_cached.clear()
+
+
 def update_athlete(athlete_id: str, updated_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Update an athlete's information with audit logging.
@@ -296,6 +320,8 @@ def update_athlete(athlete_id: str, updated_data: Dict[str, Any]) -> Dict[str, A
             .execute()
         
         if result.data:
+            _invalidate_athlete_caches()
+            
             # Create audit log
             create_audit_log(
                 action='UPDATE',
@@ -334,22 +360,19 @@ def delete_athlete(athlete_id: str, athlete_name: str) -> Dict[str, Any]:
         token = st.session_state.session.access_token
         supabase = get_authenticated_client(token)
         
-        # First, get the athlete data for audit
-        athlete_result = supabase.table('athletes')\
-            .select('*')\
+        # Delete the athlete - PostgREST returns the deleted row, which the
+        # audit log needs, so no separate SELECT is required
+        result = supabase.table('athletes')\
+            .delete()\
             .eq('id', athlete_id)\
             .execute()
         
-        if not athlete_result.data:
+        if not result.data:
             return {'success': False, 'error': 'Athlete not found'}
         
-        athlete_data = athlete_result.data[0]
+        athlete_data = result.data[0]
         
-        # Delete the athlete
-        result = supabase.table('athletes')\
-            .delete()\
-            .eq('id', athlete_id)\
-            .execute()
+        _invalidate_athlete_caches()
         
         # Create audit log (preserves deleted data)
         create_audit_log(
@@ -366,50 +389,51 @@ def delete_athlete(athlete_id: str, athlete_name: str) -> Dict[str, Any]:
         return {'success': False, 'error': str(e)}
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_athlete_stats_cached(user_id: str, token: str) -> Dict[str, Any]:
+    """
+    Cached athlete statistics.
+    Keyed on user and token so cached counts never cross RLS scopes.
+    """
+    supabase = get_authenticated_client(token)
+    
+    # Aggregate in the database (see athlete_stats() in schema.sql)
+    try:
+        rpc_result = supabase.rpc('athlete_stats').execute()
+        if rpc_result.data:
+            return rpc_result.data
+    except Exception:
+        # Function not installed yet - fall back to counting client-side
+        pass
+    
+    # Only the columns the counts below read
+    result = supabase.table('athletes')\
+        .select('competition_day, belt_rank, gender, kata_event, kumite_event')\
+        .execute()
+    athletes = result.data or []
+    
+    day_counts = Counter(a.get('competition_day') for a in athletes)
+    gender_counts = Counter(a.get('gender') for a in athletes)
+    
+    return {
+        'total': len(athletes),
+        'by_day': {day: day_counts[day] for day in COMPETITION_DAYS},
+        'by_belt': dict(Counter(a.get('belt_rank', 'Unknown') for a in athletes)),
+        'by_gender': {gender: gender_counts[gender] for gender in GENDERS},
+        'kata': sum(1 for a in athletes if a.get('kata_event')),
+        'kumite': sum(1 for a in athletes if a.get('kumite_event'))
+    }
+
+
 def get_athlete_stats(all_dojos: bool = False) -> Dict[str, Any]:
     """Get statistics about registered athletes."""
     try:
-        if not st.session_state.get('session'):
+        user = get_current_user()
+        if not user or not st.session_state.get('session'):
              return {'total': 0, 'by_day': {}, 'by_belt': {}, 'by_gender': {}, 'kata': 0, 'kumite': 0}
              
         token = st.session_state.session.access_token
-        supabase = get_authenticated_client(token)
-        
-        # Base query
-        result = supabase.table('athletes').select('*').execute()
-        athletes = result.data or []
-        
-        stats = {
-            'total': len(athletes),
-            'by_day': {'Day 1': 0, 'Day 2': 0, 'Both': 0},
-            'by_belt': {},
-            'by_gender': {'Male': 0, 'Female': 0},
-            'kata': 0,
-            'kumite': 0
-        }
-        
-        for athlete in athletes:
-            # By day
-            day = athlete.get('competition_day', 'Unknown')
-            if day in stats['by_day']:
-                stats['by_day'][day] += 1
-            
-            # By belt
-            belt = athlete.get('belt_rank', 'Unknown')
-            stats['by_belt'][belt] = stats['by_belt'].get(belt, 0) + 1
-            
-            # By gender
-            gender = athlete.get('gender', 'Unknown')
-            if gender in stats['by_gender']:
-                stats['by_gender'][gender] += 1
-            
-            # Events
-            if athlete.get('kata_event'):
-                stats['kata'] += 1
-            if athlete.get('kumite_event'):
-                stats['kumite'] += 1
-        
-        return stats
+        return _get_athlete_stats_cached(user.id, token)
 
     except Exception as e:
         # Return empty stats on error
@@ -5,8 +5,120 @@ Handles immutable audit logging for data safety (the "Black Box")
 
 import streamlit as st
 from typing import Dict, List, Any, Optional
+from datetime import datetime
 from src.auth.supabase_client import get_supabase_client, get_authenticated_client
-import json
+from src.auth.session import get_current_user
+import atexit
+import queue
+import threading
+import time
+
+
+# Display icon per audit action
+ACTION_ICONS = {
+    'REGISTER': '➕',
+    'UPDATE': '✏️',
+    'DELETE': '🗑️',
+    'BULK_REGISTER': '📦'
+}
+
+# Background writer settings
+AUDIT_BATCH_SIZE = 50
+AUDIT_FLUSH_INTERVAL = 0.5  # seconds
+AUDIT_INSERT_ATTEMPTS = 2  # first try plus one retry
+AUDIT_RETRY_DELAY = 1.0  # seconds
+AUDIT_SHUTDOWN_TIMEOUT = 10  # seconds to wait for the final flush at exit
+
+# Queued in place of an entry to tell the writer to flush and stop
+_STOP = None
+
+
+def _insert_audit_batch(batch: List[tuple]):
+    """
+    Insert a batch of queued (client, entry) pairs.
+    Each client's entries are retried once before being dropped.
+    """
+    # Entries must be inserted with their author's client (RLS), so group by client
+    by_client = {}
+    for client, log_entry in batch:
+        by_client.setdefault(id(client), (client, []))[1].append(log_entry)
+    
+    for client, entries in by_client.values():
+        for attempt in range(1, AUDIT_INSERT_ATTEMPTS + 1):
+            try:
+                client.table('audit_logs').insert(entries).execute()
+                break
+            except Exception as e:
+                if attempt == AUDIT_INSERT_ATTEMPTS:
+                    # Log error - the main operation has already completed
+                    print(f"Warning: Failed to create {len(entries)} audit log(s): {e}")
+                else:
+                    time.sleep(AUDIT_RETRY_DELAY)
+    
+    _get_audit_logs_cached.clear()
+    _get_audit_summary_cached.clear()
+
+
+def _flush_audit_queue(audit_queue: queue.Queue):
+    """
+    Background loop: drain queued audit entries and insert them in batches.
+    Waits for the first entry, then collects up to AUDIT_BATCH_SIZE entries
+    or until AUDIT_FLUSH_INTERVAL elapses, whichever comes first.
+    Returns after flushing once _STOP is received.
+    """
+    while True:
+        item = audit_queue.get()
+        if item is _STOP:
+            return
+        
+        batch = [item]
+        stopping = False
+        deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+        
+        while len(batch) < AUDIT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = audit_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stopping = True
+                break
+            batch.append(item)
+        
+        _insert_audit_batch(batch)
+        if stopping:
+            return
+
+
+def _stop_audit_writer(audit_queue: queue.Queue, writer: threading.Thread):
+    """
+    Exit hook: let the writer flush everything still queued.
+    The writer is a daemon thread, so without this pending entries are lost.
+    """
+    audit_queue.put(_STOP)
+    writer.join(timeout=AUDIT_SHUTDOWN_TIMEOUT)
+
+
+@st.cache_resource
+def _get_audit_queue() -> queue.Queue:
+    """
+    Get the process-wide audit queue.
+    The writer thread is started once, shared by all sessions, and
+    drained on interpreter exit.
+    """
+    audit_queue = queue.Queue()
+    writer = threading.Thread(
+        target=_flush_audit_queue,
+        args=(audit_queue,),
+        name='audit-log-writer',
+        daemon=True
+    )
+    writer.start()
+    atexit.register(_stop_audit_writer, audit_queue, writer)
+    return audit_queue
 
 
 def create_audit_log(
@@ -28,7 +140,10 @@ def create_audit_log(
         dojo_name: Name of the dojo
     
     Returns:
-        True if successful, False otherwise
+        True if the entry was queued, False otherwise
+    
+    The insert happens on a background thread (batched with other entries),
+    so callers don't wait on the extra round trip.
     """
     try:
         if not st.session_state.get('session'):
@@ -45,8 +160,8 @@ def create_audit_log(
             'dojo_name': dojo_name
         }
         
-        result = supabase.table('audit_logs').insert(log_entry).execute()
-        return bool(result.data)
+        _get_audit_queue().put((supabase, log_entry))
+        return True
         
     except Exception as e:
         # Log error but don't fail the main operation
@@ -54,6 +169,39 @@ def create_audit_log(
         return False
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_audit_logs_cached(
+    user_id: str,
+    token: str,
+    limit: int,
+    action_filter: Optional[str],
+    coach_filter: Optional[str],
+    dojo_filter: Optional[str]
+) -> List[Dict[str, Any]]:
+    """
+    Cached audit log query.
+    Keyed on user and token so cached rows never cross RLS scopes.
+    """
+    supabase = get_authenticated_client(token)
+    
+    query = supabase.table('audit_logs')\
+        .select('id, action, athlete_data, coach_email, dojo_name, created_at')\
+        .order('created_at', desc=True)\
+        .limit(limit)
+    
+    if action_filter and action_filter != 'All':
+        query = query.eq('action', action_filter)
+    
+    if coach_filter:
+        query = query.ilike('coach_email', f'%{coach_filter}%')
+    
+    if dojo_filter:
+        query = query.ilike('dojo_name', f'%{dojo_filter}%')
+    
+    result = query.execute()
+    return result.data if result.data else []
+
+
 def get_audit_logs(
     limit: int = 100,
     action_filter: Optional[str] = None,
@@ -73,39 +221,47 @@ def get_audit_logs(
         List of audit log entries
     """
     try:
-        if not st.session_state.get('session'):
+        user = get_current_user()
+        if not user or not st.session_state.get('session'):
              return []
              
         token = st.session_state.session.access_token
-        supabase = get_authenticated_client(token)
-        
-        query = supabase.table('audit_logs')\
-            .select('*')\
-            .order('created_at', desc=True)\
-            .limit(limit)
-        
-        if action_filter and action_filter != 'All':
-            query = query.eq('action', action_filter)
-        
-        if coach_filter:
-            query = query.ilike('coach_email', f'%{coach_filter}%')
-        
-        if dojo_filter:
-            query = query.ilike('dojo_name', f'%{dojo_filter}%')
-        
-        result = query.execute()
-        return result.data if result.data else []
+        return _get_audit_logs_cached(
+            user.id, token, limit, action_filter, coach_filter, dojo_filter
+        )
         
     except Exception as e:
         st.error(f"Error fetching audit logs: {e}")
         return []
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_audit_summary_cached(user_id: str, token: str) -> Optional[Dict[str, Any]]:
+    """
+    Cached audit summary, aggregated in the database.
+    See audit_summary() in schema.sql.
+    """
+    supabase = get_authenticated_client(token)
+    result = supabase.rpc('audit_summary').execute()
+    return result.data
+
+
 def get_audit_summary() -> Dict[str, Any]:
     """
     Get a summary of audit log statistics (Admin only).
     """
     try:
+        user = get_current_user()
+        if user and st.session_state.get('session'):
+            try:
+                token = st.session_state.session.access_token
+                summary = _get_audit_summary_cached(user.id, token)
+                if summary:
+                    return summary
+            except Exception:
+                # Function not installed yet - fall back to aggregating recent logs
+                pass
+        
         logs = get_audit_logs(limit=1000)
         
         summary = {
@@ -143,34 +299,20 @@ def format_audit_log_for_display(log: Dict[str, Any]) -> Dict[str, Any]:
     """
     Format an audit log entry for user-friendly display.
     """
-    from datetime import datetime
-    
-    # Parse timestamp
+    # Parse timestamp (PostgREST returns ISO 8601 with a '+00:00' offset)
     created_at = log.get('created_at', '')
     try:
-        dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+        dt = datetime.fromisoformat(created_at)
         formatted_time = dt.strftime('%Y-%m-%d %H:%M:%S')
     except:
         formatted_time = created_at
     
     # Format action with emoji
-    action_icons = {
-        'REGISTER': '➕',
-        'UPDATE': '✏️',
-        'DELETE': '🗑️',
-        'BULK_REGISTER': '📦'
-    }
-    
     action = log.get('action', 'Unknown')
-    action_display = f"{action_icons.get(action, '📋')} {action}"
-    
-    # Parse athlete data
-    athlete_data = log.get('athlete_data', {})
-    if isinstance(athlete_data, str):
-        try:
-            athlete_data = json.loads(athlete_data)
-        except:
-            pass
+    action_display = f"{ACTION_ICONS.get(action, '📋')} {action}"
+    
+    # athlete_data is a JSONB column, so PostgREST already returns a dict
+    athlete_data = log.get('athlete_data') or {}
     
     # Create description
     if action == 'REGISTER':
@@ -5,35 +5,53 @@ Handles dynamic tournament configuration (Admin-managed)
 
 import streamlit as st
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 from src.auth.supabase_client import get_supabase_client, get_authenticated_client
 from src.auth.session import get_current_user
 
+# Use orjson for decoding when it's installed (faster C parser)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Config keys that registration status and the deadline countdown depend on
+REGISTRATION_KEYS = ('registration_open', 'registration_deadline')
+
 
 @st.cache_data(ttl=60)  # Cache for 1 minute
+def _get_config_dict() -> Dict[str, Any]:
+    """
+    Fetch all configuration values in a single query.
+    Cached for performance; every config getter reads from this dict.
+    """
+    supabase = get_supabase_client()
+    result = supabase.table('config')\
+        .select('key, value')\
+        .execute()
+    
+    return {row['key']: _maybe_json(row['value']) for row in result.data or []}
+
+
+def _maybe_json(value: Any) -> Any:
+    """Decode a value that was stored as a JSON string; pass others through."""
+    if isinstance(value, str):
+        try:
+            return _loads(value)
+        except ValueError:
+            pass
+    return value
+
+
 def get_config(key: str) -> Any:
     """
     Get a configuration value by key.
-    Cached for performance.
+    Served from the cached config dict.
     """
     try:
-        supabase = get_supabase_client()
-        result = supabase.table('config')\
-            .select('value')\
-            .eq('key', key)\
-            .execute()
-        
-        if result.data:
-            value = result.data[0].get('value')
-            # Parse JSON if needed
-            if isinstance(value, str):
-                try:
-                    return json.loads(value)
-                except:
-                    return value
-            return value
-        return None
+        return _get_config_dict().get(key)
         
     except Exception as e:
         st.error(f"Error fetching config '{key}': {e}")
@@ -45,24 +63,7 @@ def get_all_config() -> Dict[str, Any]:
     Get all configuration values.
     """
     try:
-        supabase = get_supabase_client()
-        result = supabase.table('config')\
-            .select('*')\
-            .execute()
-        
-        config = {}
-        for row in result.data or []:
-            key = row.get('key')
-            value = row.get('value')
-            # Parse JSON if needed
-            if isinstance(value, str):
-                try:
-                    value = json.loads(value)
-                except:
-                    pass
-            config[key] = value
-        
-        return config
+        return _get_config_dict()
         
     except Exception as e:
         st.error(f"Error fetching config: {e}")
@@ -89,14 +90,20 @@ def update_config(key: str, value: Any) -> Dict[str, Any]:
             .upsert({
                 'key': key,
                 'value': value,
-                'updated_at': datetime.utcnow().isoformat(),
+                'updated_at': datetime.now(timezone.utc).isoformat(),
                 'updated_by': user.id
             })\
             .execute()
         
         if result.data:
-            # Clear cache
-            get_config.clear()
+            # Clear cache (derived values only when their inputs changed)
+            _get_config_dict.clear()
+            if key == 'tournament_name':
+                _get_tournament_name_cached.clear()
+            if key in REGISTRATION_KEYS:
+                _parsed_deadline.clear()
+                _is_registration_open_cached.clear()
+                _get_time_until_deadline_cached.clear()
             return {'success': True}
         else:
             return {'success': False, 'error': 'Update failed'}
@@ -105,9 +112,24 @@ def update_config(key: str, value: Any) -> Dict[str, Any]:
         return {'success': False, 'error': str(e)}
 
 
+# The cached helpers below read _get_config_dict() directly so a failed
+# fetch raises instead of returning a fallback; st.cache_data doesn't
+# store exceptions, so only real values are cached. The public wrappers
+# apply the fallbacks uncached.
+
+@st.cache_data(ttl=24 * 60 * 60)  # Cache for 1 day (cleared on update)
+def _get_tournament_name_cached() -> Optional[str]:
+    """Tournament name from config (raises if config can't be fetched)."""
+    return _get_config_dict().get('tournament_name')
+
+
 def get_tournament_name() -> str:
     """Get the tournament name from config."""
-    name = get_config('tournament_name')
+    try:
+        name = _get_tournament_name_cached()
+    except Exception as e:
+        st.error(f"Error fetching config 'tournament_name': {e}")
+        name = None
     return name if name else 'Karate Championship'
 
 
@@ -117,40 +139,56 @@ def get_tournament_dates() -> Dict[str, str]:
     return dates if dates else {'day1': '', 'day2': ''}
 
 
-def is_registration_open() -> bool:
-    """Check if registration is currently open."""
+@st.cache_data(ttl=30)  # Cache for 30 seconds (cleared on update)
+def _is_registration_open_cached() -> bool:
+    """Registration status (raises if config can't be fetched)."""
     # Check the registration_open flag
-    is_open = get_config('registration_open')
-    if not is_open:
+    if not _get_config_dict().get('registration_open'):
         return False
     
     # Check deadline
-    deadline_str = get_config('registration_deadline')
-    if deadline_str:
-        try:
-            deadline = datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
-            if datetime.now(deadline.tzinfo) > deadline:
-                return False
-        except:
-            pass
+    deadline = _parsed_deadline()
+    if deadline and datetime.now(deadline.tzinfo) > deadline:
+        return False
     
     return True
 
 
-def get_registration_deadline() -> Optional[datetime]:
-    """Get the registration deadline as datetime."""
-    deadline_str = get_config('registration_deadline')
+def is_registration_open() -> bool:
+    """Check if registration is currently open."""
+    try:
+        return _is_registration_open_cached()
+    except Exception as e:
+        st.error(f"Error fetching config 'registration_open': {e}")
+        return False
+
+
+@st.cache_data(ttl=60)  # Cache for 1 minute (cleared on update)
+def _parsed_deadline() -> Optional[datetime]:
+    """Parse the registration deadline once per cache window."""
+    deadline_str = _get_config_dict().get('registration_deadline')
     if deadline_str:
         try:
+            # 'Z' suffix isn't accepted by fromisoformat before Python 3.11
             return datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
-        except:
+        except (AttributeError, TypeError, ValueError):
             pass
     return None
 
 
-def get_time_until_deadline() -> Optional[str]:
-    """Get human-readable time until registration deadline."""
-    deadline = get_registration_deadline()
+def get_registration_deadline() -> Optional[datetime]:
+    """Get the registration deadline as datetime."""
+    try:
+        return _parsed_deadline()
+    except Exception as e:
+        st.error(f"Error fetching config 'registration_deadline': {e}")
+        return None
+
+
+@st.cache_data(ttl=10)  # Cache for 10 seconds
+def _get_time_until_deadline_cached() -> Optional[str]:
+    """Deadline countdown text (raises if config can't be fetched)."""
+    deadline = _parsed_deadline()
     if not deadline:
         return None
     
@@ -170,3 +208,12 @@ def get_time_until_deadline() -> Optional[str]:
         return f"{hours}h {minutes}m remaining"
     else:
         return f"{minutes}m remaining"
+
+
+def get_time_until_deadline() -> Optional[str]:
+    """Get human-readable time until registration deadline."""
+    try:
+        return _get_time_until_deadline_cached()
+    except Exception as e:
+        st.error(f"Error fetching config 'registration_deadline': {e}")
+        return None
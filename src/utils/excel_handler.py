@@ -7,10 +7,11 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, List, Any, Tuple, Optional
 from io import BytesIO
-from datetime import datetime
+from datetime import datetime, date
+from functools import lru_cache
 from src.utils.validators import (
-    validate_excel_row, normalize_athlete_data,
-    BELT_RANKS, GENDERS, COMPETITION_DAYS
+    validate_excel_row,
+    BELT_RANKS, GENDERS, COMPETITION_DAYS, MIN_AGE_DAYS, MAX_AGE_DAYS
 )
 
 
@@ -55,6 +56,77 @@ COLUMN_MAPPINGS = {
 }
 
 
+# Lowercase lookups for the normalizers (built once, not per row)
+_BELT_LOWER = {belt.lower(): belt for belt in BELT_RANKS}
+
+_GENDER_MAP = {
+    'male': 'Male', 'm': 'Male', 'boy': 'Male', 'man': 'Male',
+    'female': 'Female', 'f': 'Female', 'girl': 'Female', 'woman': 'Female'
+}
+
+_BOOL_TRUE = frozenset({'yes', 'true', '1', 'y', 'x', '✓', '✔'})
+
+
+# Stop reporting errors for an upload once this many have been collected
+MAX_ERRORS = 100
+
+
+# Athlete fields produced by the import, in output order
+ATHLETE_FIELDS = [
+    'full_name', 'date_of_birth', 'gender', 'belt_rank',
+    'weight_kg', 'competition_day', 'kata_event', 'kumite_event'
+]
+
+
+def _read_sheet_rows(uploaded_file) -> List[tuple]:
+    """
+    Read the cell values of the workbook's first sheet, header row first.
+    Streams the sheet from openpyxl in read-only mode, matching what
+    pd.read_excel did: stale stored dimensions are ignored and error
+    cells ('#N/A', '#REF!', ...) come back as None.
+    """
+    from openpyxl import load_workbook
+    from openpyxl.cell.cell import ERROR_CODES
+    
+    wb = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        # Read-only sheets trust the file's <dimension> tag, which some
+        # tools write wrong (e.g. 'A1:A1') - rescan instead of truncating
+        ws.reset_dimensions()
+        return [
+            tuple(None if isinstance(value, str) and value in ERROR_CODES else value for value in row)
+            for row in ws.iter_rows(values_only=True)
+        ]
+    finally:
+        wb.close()
+
+
+def read_excel_rows(uploaded_file) -> pd.DataFrame:
+    """
+    Read the main sheet into a DataFrame (first row is the header).
+    Builds the frame straight from the cell values, skipping pandas'
+    per-cell conversion layer.
+    """
+    rows = _read_sheet_rows(uploaded_file)
+    if not rows:
+        return pd.DataFrame()
+    
+    columns = [
+        str(name) if name is not None else f'Unnamed: {idx}'
+        for idx, name in enumerate(rows[0])
+    ]
+    width = len(columns)
+    # Pad short rows and drop cells beyond the header
+    data = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows[1:]]
+    
+    # Trailing blank rows are common in hand-edited sheets
+    while data and all(value is None for value in data[-1]):
+        data.pop()
+    
+    return pd.DataFrame(data, columns=columns)
+
+
 def parse_excel_file(uploaded_file) -> Tuple[bool, List[Dict[str, Any]], List[str]]:
     """
     Parse an uploaded Excel file and validate its contents.
@@ -64,7 +136,7 @@ def parse_excel_file(uploaded_file) -> Tuple[bool, List[Dict[str, Any]], List[st
     """
     try:
         # Read Excel file
-        df = pd.read_excel(uploaded_file, engine='openpyxl')
+        df = read_excel_rows(uploaded_file)
         
         if df.empty:
             return False, [], ["The Excel file is empty"]
@@ -92,32 +164,50 @@ def parse_excel_file(uploaded_file) -> Tuple[bool, List[Dict[str, Any]], List[st
         if missing:
             return False, [], [f"Missing required columns: {', '.join(missing)}"]
         
-        # Process each row
-        athletes = []
+        # Optional columns fall back to the same defaults as missing cells
+        if 'weight_kg' not in df.columns:
+            df['weight_kg'] = None
+        for col in ('kata_event', 'kumite_event'):
+            if col not in df.columns:
+                df[col] = True
+        
+        # Normalize column by column instead of materializing a Series per row.
+        # Object dtype hands the parsers Python scalars (bool, not numpy.bool_).
+        df = df.astype(object)
+        df['full_name'] = df['full_name'].map(lambda v: str(v).strip() if pd.notna(v) else '')
+        df['gender'] = df['gender'].map(normalize_gender)
+        df['belt_rank'] = df['belt_rank'].map(normalize_belt)
+        df['competition_day'] = df['competition_day'].map(normalize_day)
+        df['kata_event'] = df['kata_event'].map(parse_boolean)
+        df['kumite_event'] = df['kumite_event'].map(parse_boolean)
+        # Keep missing dates and weights as None, not NaN: newer pandas infers
+        # a NaN-filled column from map(), and NaN is truthy in the validators
+        dobs = df['date_of_birth'].map(parse_date).astype(object)
+        df['date_of_birth'] = dobs.where(dobs.notna(), None)
+        weights = df['weight_kg'].map(parse_weight).astype(object)
+        df['weight_kg'] = weights.where(weights.notna(), None)
+        
+        df = df[ATHLETE_FIELDS]
+        
+        # Validate all rows at once; only failing rows go through the
+        # per-field validators to build their error messages
+        valid_rows = valid_rows_mask(df)
         all_errors = []
         
-        for idx, row in df.iterrows():
+        for idx in valid_rows.index[~valid_rows]:
             row_num = idx + 2  # Excel rows are 1-indexed, plus header row
-            
-            # Build athlete data
-            athlete_data = {
-                'full_name': str(row.get('full_name', '')).strip() if pd.notna(row.get('full_name')) else '',
-                'date_of_birth': parse_date(row.get('date_of_birth')),
-                'gender': normalize_gender(row.get('gender', '')),
-                'belt_rank': normalize_belt(row.get('belt_rank', '')),
-                'weight_kg': parse_weight(row.get('weight_kg')),
-                'competition_day': normalize_day(row.get('competition_day', '')),
-                'kata_event': parse_boolean(row.get('kata_event', True)),
-                'kumite_event': parse_boolean(row.get('kumite_event', True))
-            }
-            
-            # Validate
-            is_valid, errors = validate_excel_row(athlete_data, row_num)
+            is_valid, errors = validate_excel_row(df.loc[idx].to_dict(), row_num)
             
             if is_valid:
-                athletes.append(normalize_athlete_data(athlete_data))
+                valid_rows.loc[idx] = True
             else:
                 all_errors.extend(errors)
+                if len(all_errors) >= MAX_ERRORS:
+                    # Stop building messages; rows not re-checked stay excluded
+                    all_errors.append("(more errors truncated)")
+                    break
+        
+        athletes = normalize_athletes_df(df[valid_rows])
         
         if not athletes and all_errors:
             return False, [], all_errors
@@ -128,6 +218,52 @@ def parse_excel_file(uploaded_file) -> Tuple[bool, List[Dict[str, Any]], List[st
         return False, [], [f"Error reading Excel file: {str(e)}"]
 
 
+def normalize_athletes_df(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Clean validated import rows before insertion (title-cased names,
+    numeric weights). Returns one dict per row, ready for bulk registration.
+    """
+    weights = pd.to_numeric(df['weight_kg'], errors='coerce').astype(object)
+    df = df.assign(
+        full_name=df['full_name'].str.strip().str.title(),
+        weight_kg=weights.where(weights.notna(), None)
+    )
+    return df.to_dict(orient='records')
+
+
+def valid_rows_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Column-wise equivalent of validate_athlete_data for normalized rows.
+    True means the row is definitely valid; False rows must still be run
+    through validate_excel_row, which has the final say and the messages.
+    """
+    name_length = df['full_name'].str.strip().str.len()
+    
+    dob = pd.to_datetime(df['date_of_birth'], format='%Y-%m-%d', errors='coerce')
+    age_days = (pd.Timestamp(date.today()) - dob).dt.days
+    
+    weight = pd.to_numeric(df['weight_kg'], errors='coerce')
+    
+    return (
+        name_length.between(2, 100)
+        & age_days.between(MIN_AGE_DAYS, MAX_AGE_DAYS)
+        & df['gender'].isin(GENDERS)
+        & df['belt_rank'].isin(BELT_RANKS)
+        & (weight.isna() | weight.between(10, 200))
+        & df['competition_day'].isin(COMPETITION_DAYS)
+        & (df['kata_event'].astype(bool) | df['kumite_event'].astype(bool))
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Age checks depend on today's date
+def parse_excel_file_cached(file_bytes: bytes) -> Tuple[bool, List[Dict[str, Any]], List[str]]:
+    """
+    Cached parse_excel_file keyed on the uploaded file's contents,
+    so reruns with the same upload skip parsing and validation.
+    """
+    return parse_excel_file(BytesIO(file_bytes))
+
+
 def parse_date(value) -> Optional[str]:
     """Parse date from various formats."""
     if pd.isna(value):
@@ -137,17 +273,27 @@ def parse_date(value) -> Optional[str]:
         return value.strftime('%Y-%m-%d')
     
     if isinstance(value, str):
-        # Try common formats
-        formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y']
-        for fmt in formats:
-            try:
-                return datetime.strptime(value.strip(), fmt).strftime('%Y-%m-%d')
-            except ValueError:
-                continue
+        return _parse_date_str(value)
     
     return str(value)
 
 
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> str:
+    """
+    Parse a date string by trying the common formats in turn.
+    Cached because imports repeat the same dates across many rows.
+    """
+    formats = ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y']
+    for fmt in formats:
+        try:
+            return datetime.strptime(value.strip(), fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    
+    return value
+
+
 def parse_weight(value) -> Optional[float]:
     """Parse weight value."""
     if pd.isna(value):
@@ -171,7 +317,7 @@ def parse_boolean(value) -> bool:
         return bool(value)
     
     if isinstance(value, str):
-        return value.lower().strip() in ['yes', 'true', '1', 'y', 'x', '✓', '✔']
+        return value.lower().strip() in _BOOL_TRUE
     
     return False
 
@@ -183,12 +329,7 @@ def normalize_gender(value) -> str:
     
     value = str(value).strip().lower()
     
-    if value in ['male', 'm', 'boy', 'man']:
-        return 'Male'
-    elif value in ['female', 'f', 'girl', 'woman']:
-        return 'Female'
-    
-    return str(value).title()
+    return _GENDER_MAP.get(value) or value.title()
 
 
 def normalize_belt(value) -> str:
@@ -199,16 +340,24 @@ def normalize_belt(value) -> str:
     value = str(value).strip().lower()
     
     # Direct match
-    for belt in BELT_RANKS:
-        if belt.lower() == value:
-            return belt
+    belt = _BELT_LOWER.get(value)
+    if belt:
+        return belt
     
-    # Partial match
-    for belt in BELT_RANKS:
-        if value in belt.lower() or belt.lower() in value:
+    return _match_belt_partial(value)
+
+
+@lru_cache(maxsize=256)
+def _match_belt_partial(value: str) -> str:
+    """
+    Partial belt match for a lowercased value that isn't an exact rank.
+    Cached so each distinct spelling in an import is scanned only once.
+    """
+    for belt_lower, belt in _BELT_LOWER.items():
+        if value in belt_lower or belt_lower in value:
             return belt
     
-    return str(value).title()
+    return value.title()
 
 
 def normalize_day(value) -> str:
@@ -228,10 +377,31 @@ def normalize_day(value) -> str:
     return str(value).title()
 
 
+def _set_column_widths(worksheet, df: pd.DataFrame, max_width: Optional[int] = None):
+    """
+    Size each column to its longest value or header (plus padding).
+    Cell lengths for the whole frame are measured in a single pass.
+    """
+    lengths = df.astype(str).apply(lambda col: col.str.len().max())
+    
+    for idx, (col, length) in enumerate(lengths.items()):
+        width = max(int(length), len(col)) + 2
+        if max_width:
+            width = min(width, max_width)
+        worksheet.set_column(idx, idx, width)
+
+
 def generate_excel_template() -> bytes:
     """
     Generate a blank Excel template for athlete registration.
+    The template never changes, so it is built once and reused.
     """
+    return _build_template_bytes()
+
+
+@lru_cache(maxsize=1)
+def _build_template_bytes() -> bytes:
+    """Build the template workbook bytes (see generate_excel_template)."""
     # Create sample data
     data = {
         'Name': ['John Doe', 'Jane Smith'],
@@ -248,20 +418,11 @@ def generate_excel_template() -> bytes:
     
     # Write to bytes buffer
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
         df.to_excel(writer, index=False, sheet_name='Athletes')
         
-        # Get workbook and worksheet for formatting
-        workbook = writer.book
-        worksheet = writer.sheets['Athletes']
-        
         # Adjust column widths
-        for idx, col in enumerate(df.columns):
-            max_length = max(
-                df[col].astype(str).map(len).max(),
-                len(col)
-            ) + 2
-            worksheet.column_dimensions[chr(65 + idx)].width = max_length
+        _set_column_widths(writer.sheets['Athletes'], df)
     
     return output.getvalue()
 
@@ -295,19 +456,10 @@ def export_athletes_to_excel(athletes: List[Dict[str, Any]], filename: str = "at
     
     # Write to bytes buffer
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
         df.to_excel(writer, index=False, sheet_name='Athletes')
         
         # Adjust column widths
-        workbook = writer.book
-        worksheet = writer.sheets['Athletes']
-        
-        for idx, col in enumerate(df.columns):
-            max_length = max(
-                df[col].astype(str).map(len).max(),
-                len(col)
-            ) + 2
-            col_letter = chr(65 + idx) if idx < 26 else chr(65 + idx // 26 - 1) + chr(65 + idx % 26)
-            worksheet.column_dimensions[col_letter].width = min(max_length, 30)
+        _set_column_widths(writer.sheets['Athletes'], df, max_width=30)
     
     return output.getvalue()
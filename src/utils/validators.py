@@ -18,14 +18,22 @@ GENDERS = ['Male', 'Female']
 
 COMPETITION_DAYS = ['Day 1', 'Day 2', 'Both']
 
+# Precompiled patterns
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_SEP_RE = re.compile(r'[\s\-\(\)\.]')
+_PHONE_RE = re.compile(r'^\+?[0-9]{7,15}$')
+
+# Age limits in days (3 and 100 years of 365.25 days)
+MIN_AGE_DAYS = 1096
+MAX_AGE_DAYS = 36525
+
 
 def validate_email(email: str) -> Tuple[bool, str]:
     """Validate email format."""
     if not email or not email.strip():
         return False, "Email is required"
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(pattern, email.strip()):
+    if not _EMAIL_RE.match(email.strip()):
         return False, "Invalid email format"
     
     return True, ""
@@ -37,10 +45,10 @@ def validate_phone(phone: str) -> Tuple[bool, str]:
         return True, ""  # Phone is optional
     
     # Remove common separators
-    cleaned = re.sub(r'[\s\-\(\)\.]', '', phone)
+    cleaned = _PHONE_SEP_RE.sub('', phone)
     
     # Check if it's a valid number (allows + for country code)
-    if not re.match(r'^\+?[0-9]{7,15}$', cleaned):
+    if not _PHONE_RE.match(cleaned):
         return False, "Invalid phone number format"
     
     return True, ""
@@ -48,13 +56,14 @@ def validate_phone(phone: str) -> Tuple[bool, str]:
 
 def validate_athlete_name(name: str) -> Tuple[bool, str]:
     """Validate athlete name."""
-    if not name or not name.strip():
+    length = len(name.strip()) if name else 0
+    if not length:
         return False, "Name is required"
     
-    if len(name.strip()) < 2:
+    if length < 2:
         return False, "Name must be at least 2 characters"
     
-    if len(name.strip()) > 100:
+    if length > 100:
         return False, "Name must be less than 100 characters"
     
     return True, ""
@@ -78,10 +87,10 @@ def validate_date_of_birth(dob: Any) -> Tuple[bool, str]:
         return False, "Date of birth must be in the past"
     
     # Check reasonable age range (3 to 100 years)
-    age = (today - dob).days / 365.25
-    if age < 3:
+    age_days = (today - dob).days
+    if age_days < MIN_AGE_DAYS:
         return False, "Athlete must be at least 3 years old"
-    if age > 100:
+    if age_days > MAX_AGE_DAYS:
         return False, "Invalid date of birth"
     
     return True, ""
@@ -180,38 +189,3 @@ def validate_excel_row(row: Dict[str, Any], row_number: int) -> Tuple[bool, List
     prefixed_errors = [f"Row {row_number}: {error}" for error in errors]
     
     return is_valid, prefixed_errors
-
-
-def normalize_athlete_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Normalize and clean athlete data before insertion.
-    """
-    normalized = {}
-    
-    # Clean string fields
-    if 'full_name' in data:
-        normalized['full_name'] = data['full_name'].strip().title()
-    
-    # Normalize date
-    if 'date_of_birth' in data:
-        dob = data['date_of_birth']
-        if isinstance(dob, datetime):
-            normalized['date_of_birth'] = dob.strftime('%Y-%m-%d')
-        elif isinstance(dob, date):
-            normalized['date_of_birth'] = dob.strftime('%Y-%m-%d')
-        else:
-            normalized['date_of_birth'] = str(dob)
-    
-    # Copy other fields
-    for field in ['gender', 'belt_rank', 'competition_day', 'kata_event', 'kumite_event']:
-        if field in data:
-            normalized[field] = data[field]
-    
-    # Handle weight
-    if 'weight_kg' in data and data['weight_kg']:
-        try:
-            normalized['weight_kg'] = float(data['weight_kg'])
-        except:
-            normalized['weight_kg'] = None
-    
-    return normalized